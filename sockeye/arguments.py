@@ -22,8 +22,13 @@ from typing import Any, Callable, Dict, List, Tuple, Optional
 
 import yaml
 
+try:
+    # Use the libyaml-based implementations if available
+    from yaml import CSafeDumper as SafeDumper, CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeDumper, SafeLoader  # type: ignore
+
 from . import constants as C
-from . import data_io
 
 
 class ConfigArgumentParser(argparse.ArgumentParser):
@@ -95,12 +100,12 @@ class StoreDeprecatedAction(argparse.Action):
 
 def save_args(args: argparse.Namespace, fname: str):
     with open(fname, 'w') as out:
-        yaml.safe_dump(args.__dict__, out, default_flow_style=False)
+        yaml.dump(args.__dict__, out, Dumper=SafeDumper, default_flow_style=False)
 
 
 def load_args(fname: str) -> argparse.Namespace:
     with open(fname, 'r') as inp:
-        return argparse.Namespace(**yaml.safe_load(inp))
+        return argparse.Namespace(**yaml.load(inp, Loader=SafeLoader))
 
 
 class Removed(argparse.Action):
@@ -271,7 +276,9 @@ def file_or_stdin() -> Callable:
         if path is None or path == "-":
             return sys.stdin
         else:
-            return data_io.smart_open(path)
+            # Imported here to keep this module free of MXNet imports.
+            from .utils import smart_open
+            return smart_open(path)
 
     return parse
 
@@ -487,6 +494,10 @@ def add_training_output_args(params):
     params.add_argument('--overwrite-output',
                         action='store_true',
                         help='Delete all contents of the model directory if it already exists.')
+    params.add_argument('--cache-training-data',
+                        action='store_true',
+                        help='Cache the bucketed raw training data in the model directory so that resumed training '
+                             'runs skip reading and numericalizing the corpus. Default: %(default)s.')
 
 
 def add_training_io_args(params):
@@ -583,17 +594,20 @@ def add_device_args(params):
                                     '%(default)s.')
     device_params.add_argument('--env',
                                help='List of environment variables to be set before importing MXNet. Separated by ",", '
-                                    'e.g. --env=OMP_NUM_THREADS=4,MXNET_GPU_WORKER_NTHREADS=3 etc.')
+                                    'e.g. --env=OMP_NUM_THREADS=4,MXNET_GPU_WORKER_NTHREADS=3 etc. Training uses '
+                                    'MXNET_GPU_MEM_POOL_TYPE=Round unless set otherwise.')
     device_params.add_argument('--disable-device-locking',
                                action='store_true',
                                help='Just use the specified device ids without locking.')
     device_params.add_argument('--lock-dir',
-                               default="/tmp",
+                               default=os.environ.get(C.SOCKEYE_LOCK_DIR, C.DEFAULT_LOCK_DIR),
                                help='When acquiring a GPU we do file based locking so that only one Sockeye process '
                                     'can run on the a GPU. This is the folder in which we store the file '
                                     'locks. For locking to work correctly it is assumed all processes use the same '
                                     'lock directory. The only requirement for the directory are file '
-                                    'write permissions.')
+                                    'write permissions. It is created if it does not exist. Use a node-local '
+                                    'directory rather than a network file system. Default: %s environment variable '
+                                    'if set, otherwise %s.' % (C.SOCKEYE_LOCK_DIR, C.DEFAULT_LOCK_DIR))
 
 
 def add_vocab_args(params):
@@ -1070,6 +1084,13 @@ def add_training_args(params):
                               help='Stop training as soon as any checkpoint decoder fails (e.g. because there is not '
                                    'enough GPU memory). Default: %(default)s.')
 
+    train_params.add_argument('--prefetch',
+                              action='store_true',
+                              help='Prepare the next training and validation batch in a background thread while the '
+                                   'current batch is processed, including the copy to the training device(s). With '
+                                   '--prepared-data, also read the next shard while the current one is used. Not '
+                                   'supported with --horovod. Default: %(default)s.')
+
     train_params.add_argument('--seed',
                               type=int,
                               default=1,
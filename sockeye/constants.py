@@ -16,12 +16,15 @@ Defines various constants used throughout the project
 """
 import sys
 
-import mxnet as mx
 import numpy as np
 
 # MXNet environment variables
 MXNET_SAFE_ACCUMULATION = 'MXNET_SAFE_ACCUMULATION'
 
+# Sockeye environment variables
+SOCKEYE_LOCK_DIR = 'SOCKEYE_LOCK_DIR'
+DEFAULT_LOCK_DIR = '/tmp'
+
 # Horovod environment variables
 HOROVOD_HIERARCHICAL_ALLREDUCE = 'HOROVOD_HIERARCHICAL_ALLREDUCE'
 HOROVOD_HIERARCHICAL_ALLGATHER = 'HOROVOD_HIERARCHICAL_ALLGATHER'
@@ -168,8 +171,8 @@ STAT_FUNC_MAX = 'max'
 STAT_FUNC_MIN = 'min'
 STAT_FUNC_MEAN = 'mean'
 MONITOR_STAT_FUNCS = {STAT_FUNC_DEFAULT: None,
-                      STAT_FUNC_MAX: lambda x: mx.nd.max(x),
-                      STAT_FUNC_MEAN: lambda x: mx.nd.mean(x)}
+                      STAT_FUNC_MAX: lambda x: x.max(),
+                      STAT_FUNC_MEAN: lambda x: x.mean()}
 
 # Inference constants
 DEFAULT_BEAM_SIZE = 5
@@ -226,9 +229,10 @@ OPT_STATES_LAST = "mx_optimizer_last.pkl"
 OPT_STATES_BEST = "mx_optimizer_best.pkl"
 OPT_STATES_INITIAL = "mx_optimizer_initial.pkl"
 
-LR_SCHEDULER_LAST = "lr_scheduler_last.pkl"
-LR_SCHEDULER_BEST = "lr_scheduler_best.pkl"
-LR_SCHEDULER_INITIAL = "lr_scheduler_initial.pkl"
+LR_SCHEDULER_LAST = "lr_scheduler_last.json"
+LR_SCHEDULER_BEST = "lr_scheduler_best.json"
+LR_SCHEDULER_INITIAL = "lr_scheduler_initial.json"
+LR_SCHEDULER_LAST_PICKLE = "lr_scheduler_last.pkl"  # training states written by Sockeye < 2.3.22
 
 BUCKET_ITER_STATE_NAME = "bucket.pkl"
 RNG_STATE_NAME = "rng.pkl"
@@ -244,7 +248,8 @@ ARGS_MAY_DIFFER = ["overwrite_output", "use_tensorboard", "quiet",
                    "keep_last_params", "seed",
                    "max_updates", "min_updates",
                    "max_num_epochs", "min_num_epochs",
-                   "max_samples", "min_samples", "max_checkpoints", "max_seconds"]
+                   "max_samples", "min_samples", "max_checkpoints", "max_seconds", "prefetch",
+                   "cache_training_data"]
 
 # Other argument constants
 TRAINING_ARG_SOURCE = "--source"
@@ -414,6 +419,8 @@ SHARD_SOURCE = SHARD_NAME + ".source"
 SHARD_TARGET = SHARD_NAME + ".target"
 DATA_INFO = "data.info"
 DATA_CONFIG = "data.config"
+TRAINING_DATA_CACHE = "corpus.%s.data"
+TRAINING_DATA_CACHE_STATS = "corpus.%s.stats"
 PREPARED_DATA_VERSION_FILE = "data.version"
 PREPARED_DATA_VERSION = 4
 
@@ -15,6 +15,9 @@
 Implements data iterators and I/O related functions for sequence-to-sequence models.
 """
 import bisect
+import glob
+import hashlib
+import json
 import logging
 import math
 import multiprocessing
@@ -23,6 +26,7 @@ import pickle
 import random
 from abc import ABC, abstractmethod
 from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
 from contextlib import ExitStack
 from dataclasses import dataclass
 from itertools import chain
@@ -554,17 +558,19 @@ class RawParallelDatasetLoader:
             num_pad_target += buck[1] - target_len
 
             sample_index = bucket_sample_index[buck_index]
+            source_sample = data_source[buck_index][sample_index]
+            target_sample = data_target[buck_index][sample_index]
             for i, s in enumerate(sources):
-                data_source[buck_index][sample_index, 0:source_len, i] = s
+                source_sample[0:source_len, i] = s
             for i, t in enumerate(targets):
                 if i == 0 or not self.shift_target_factors:
                     # sequence: <BOS> ... <EOS>
-                    t.append(self.eos_id)
-                    data_target[buck_index][sample_index, 0:target_len + 1, i] = t
+                    target_sample[0:target_len, i] = t
+                    target_sample[target_len, i] = self.eos_id
                 else:
                     # sequence: <BOS> <BOS> ...
-                    t.insert(0, C.BOS_ID)
-                    data_target[buck_index][sample_index, 0:target_len + 1, i] = t
+                    target_sample[0, i] = C.BOS_ID
+                    target_sample[1:target_len + 1, i] = t
 
             bucket_sample_index[buck_index] += 1
 
@@ -807,7 +813,8 @@ def get_prepared_data_iters(prepared_data_dir: str,
                             batch_type: str,
                             batch_num_devices: int,
                             batch_sentences_multiple_of: int = 1,
-                            permute: bool = True) -> Tuple['BaseParallelSampleIter',
+                            permute: bool = True,
+                            prefetch_shards: bool = False) -> Tuple['BaseParallelSampleIter',
                                                            'BaseParallelSampleIter',
                                                            'DataConfig', List[vocab.Vocab], List[vocab.Vocab]]:
     logger.info("===============================")
@@ -869,7 +876,8 @@ def get_prepared_data_iters(prepared_data_dir: str,
                                            bucket_batch_sizes,
                                            num_source_factors=len(data_info.sources),
                                            num_target_factors=len(data_info.targets),
-                                           permute=permute)
+                                           permute=permute,
+                                           prefetch_shards=prefetch_shards)
 
     data_loader = RawParallelDatasetLoader(buckets=buckets,
                                            eos_id=C.EOS_ID,
@@ -889,6 +897,57 @@ def get_prepared_data_iters(prepared_data_dir: str,
     return train_iter, validation_iter, config_data, source_vocabs, target_vocabs
 
 
+def get_training_data_cache_key(sources: List[str],
+                                targets: List[str],
+                                source_vocabs: List[vocab.Vocab],
+                                target_vocabs: List[vocab.Vocab],
+                                max_seq_len_source: int,
+                                max_seq_len_target: int,
+                                bucketing: bool,
+                                bucket_width: int,
+                                bucket_scaling: bool) -> str:
+    """
+    Returns a key identifying the bucketed training data created from the given files, vocabularies, and bucketing
+    settings. Files are identified by their path, size, and modification time.
+    """
+    key = hashlib.sha1()
+    for fname in sources + targets:
+        stat = os.stat(fname)
+        key.update(("%s %d %d\n" % (os.path.abspath(fname), stat.st_size, stat.st_mtime_ns)).encode("utf-8"))
+    for vocabulary in source_vocabs + target_vocabs:
+        key.update(json.dumps(vocabulary, sort_keys=True).encode("utf-8"))
+    key.update(repr((max_seq_len_source, max_seq_len_target, bucketing, bucket_width, bucket_scaling)).encode("utf-8"))
+    return key.hexdigest()
+
+
+def save_training_data_cache(cache_dir: str, cache_key: str, training_data: 'ParallelDataSet',
+                             data_statistics: 'DataStatistics'):
+    """
+    Saves bucketed training data and its statistics to cache_dir, replacing data cached under other keys.
+    The statistics are written last and mark the cache as complete.
+    """
+    for fname in glob.glob(os.path.join(cache_dir, C.TRAINING_DATA_CACHE_STATS % "*")):
+        os.remove(fname)
+    for fname in glob.glob(os.path.join(cache_dir, C.TRAINING_DATA_CACHE % "*")):
+        os.remove(fname)
+    logger.info("Caching training data to '%s'", os.path.join(cache_dir, C.TRAINING_DATA_CACHE % cache_key))
+    training_data.save(os.path.join(cache_dir, C.TRAINING_DATA_CACHE % cache_key))
+    data_statistics.save(os.path.join(cache_dir, C.TRAINING_DATA_CACHE_STATS % cache_key))
+
+
+def load_training_data_cache(cache_dir: str,
+                             cache_key: str) -> Optional[Tuple['ParallelDataSet', 'DataStatistics']]:
+    """
+    Loads bucketed training data and its statistics cached under cache_key, if present.
+    """
+    stats_fname = os.path.join(cache_dir, C.TRAINING_DATA_CACHE_STATS % cache_key)
+    if not os.path.exists(stats_fname):
+        return None
+    data_fname = os.path.join(cache_dir, C.TRAINING_DATA_CACHE % cache_key)
+    logger.info("Loading cached training data from '%s'", data_fname)
+    return ParallelDataSet.load(data_fname), cast(DataStatistics, DataStatistics.load(stats_fname))
+
+
 def get_training_data_iters(sources: List[str],
                             targets: List[str],
                             validation_sources: List[str],
@@ -907,7 +966,8 @@ def get_training_data_iters(sources: List[str],
                             bucket_width: int,
                             bucket_scaling: bool = True,
                             allow_empty: bool = False,
-                            batch_sentences_multiple_of: int = 1) -> Tuple['BaseParallelSampleIter',
+                            batch_sentences_multiple_of: int = 1,
+                            cache_dir: Optional[str] = None) -> Tuple['BaseParallelSampleIter',
                                                                            Optional['BaseParallelSampleIter'],
                                                                            'DataConfig', 'DataInfo']:
     """
@@ -933,32 +993,47 @@ def get_training_data_iters(sources: List[str],
     :param allow_empty: Unless True if no sentences are below or equal to the maximum length an exception is raised.
     :param batch_sentences_multiple_of: Round the number of sentences in each
         bucket's batch to a multiple of this value (word-based batching only).
+    :param cache_dir: Optional directory in which the bucketed training data is cached. If it contains data created
+        from the same files, vocabularies, and bucketing settings, the training data is loaded from there instead.
 
     :return: Tuple of (training data iterator, validation data iterator, data config).
     """
     logger.info("===============================")
     logger.info("Creating training data iterator")
     logger.info("===============================")
-    # Pass 1: get target/source length ratios.
-    length_statistics = analyze_sequence_lengths(sources, targets, source_vocabs, target_vocabs,
-                                                 max_seq_len_source, max_seq_len_target)
+    cache_key = None  # type: Optional[str]
+    cached = None  # type: Optional[Tuple[ParallelDataSet, DataStatistics]]
+    if cache_dir is not None:
+        cache_key = get_training_data_cache_key(sources, targets, source_vocabs, target_vocabs,
+                                                max_seq_len_source, max_seq_len_target,
+                                                bucketing, bucket_width, bucket_scaling)
+        cached = load_training_data_cache(cache_dir, cache_key)
+
+    training_data = None  # type: Optional[ParallelDataSet]
+    if cached is not None:
+        training_data, data_statistics = cached
+        buckets = data_statistics.buckets
+    else:
+        # Pass 1: get target/source length ratios.
+        length_statistics = analyze_sequence_lengths(sources, targets, source_vocabs, target_vocabs,
+                                                     max_seq_len_source, max_seq_len_target)
 
-    if not allow_empty:
-        check_condition(length_statistics.num_sents > 0,
-                        "No training sequences found with length smaller or equal than the maximum sequence length."
-                        "Consider increasing %s" % C.TRAINING_ARG_MAX_SEQ_LEN)
+        if not allow_empty:
+            check_condition(length_statistics.num_sents > 0,
+                            "No training sequences found with length smaller or equal than the maximum sequence "
+                            "length. Consider increasing %s" % C.TRAINING_ARG_MAX_SEQ_LEN)
 
-    # define buckets
-    buckets = define_parallel_buckets(max_seq_len_source, max_seq_len_target, bucket_width, bucket_scaling,
-                                      length_statistics.length_ratio_mean) if bucketing else [(max_seq_len_source,
-                                                                                               max_seq_len_target)]
+        # define buckets
+        buckets = define_parallel_buckets(max_seq_len_source, max_seq_len_target, bucket_width, bucket_scaling,
+                                          length_statistics.length_ratio_mean) if bucketing else [(max_seq_len_source,
+                                                                                                   max_seq_len_target)]
 
-    sources_sentences, targets_sentences = create_sequence_readers(sources, targets, source_vocabs, target_vocabs)
+        sources_sentences, targets_sentences = create_sequence_readers(sources, targets, source_vocabs, target_vocabs)
 
-    # Pass 2: Get data statistics and determine the number of data points for each bucket.
-    data_statistics = get_data_statistics(sources_sentences, targets_sentences, buckets,
-                                          length_statistics.length_ratio_mean, length_statistics.length_ratio_std,
-                                          source_vocabs, target_vocabs)
+        # Pass 2: Get data statistics and determine the number of data points for each bucket.
+        data_statistics = get_data_statistics(sources_sentences, targets_sentences, buckets,
+                                              length_statistics.length_ratio_mean, length_statistics.length_ratio_std,
+                                              source_vocabs, target_vocabs)
 
     bucket_batch_sizes = define_bucket_batch_sizes(buckets,
                                                    batch_size,
@@ -974,8 +1049,12 @@ def get_training_data_iters(sources: List[str],
                                            eos_id=C.EOS_ID,
                                            pad_id=C.PAD_ID)
 
-    training_data = data_loader.load(sources_sentences, targets_sentences,
-                                     data_statistics.num_sents_per_bucket).fill_up(bucket_batch_sizes)
+    if training_data is None:
+        training_data = data_loader.load(sources_sentences, targets_sentences, data_statistics.num_sents_per_bucket)
+        if cache_key is not None:
+            save_training_data_cache(cast(str, cache_dir), cache_key, training_data, data_statistics)
+
+    training_data = training_data.fill_up(bucket_batch_sizes)
 
     data_info = DataInfo(sources=sources,
                          targets=targets,
@@ -1170,7 +1249,9 @@ def tokens2ids(tokens: Iterable[str], vocab: Dict[str, int]) -> List[int]:
     :param vocab: Vocabulary (containing UNK symbol).
     :return: List of word ids.
     """
-    return [vocab.get(w, vocab[C.UNK_SYMBOL]) for w in tokens]
+    unk_id = vocab[C.UNK_SYMBOL]
+    vocab_get = vocab.get
+    return [vocab_get(w, unk_id) for w in tokens]
 
 
 def strids2ids(tokens: Iterable[str]) -> List[int]:
@@ -1759,6 +1840,8 @@ class ShardedParallelSampleIter(BaseParallelSampleIter):
     """
     Goes through the data one shard at a time. The memory consumption is limited by the memory consumption of the
     largest shard. The order in which shards are traversed is changed with each reset.
+    With prefetch_shards, the next shard is read from disk in a background thread while the current shard is
+    iterated over, which doubles the memory limit.
     """
 
     def __init__(self,
@@ -1769,21 +1852,36 @@ class ShardedParallelSampleIter(BaseParallelSampleIter):
                  num_source_factors: int = 1,
                  num_target_factors: int = 1,
                  permute: bool = True,
-                 dtype: str = 'float32') -> None:
+                 dtype: str = 'float32',
+                 prefetch_shards: bool = False) -> None:
         super().__init__(buckets=buckets, batch_size=batch_size, bucket_batch_sizes=bucket_batch_sizes,
                          num_source_factors=num_source_factors, num_target_factors=num_target_factors,
                          permute=permute, dtype=dtype)
         assert len(shards_fnames) > 0
         self.shards_fnames = list(shards_fnames)
         self.shard_index = -1
+        self._executor = ThreadPoolExecutor(max_workers=1) if prefetch_shards else None
+        self._next_shard = None  # type: Optional[Tuple[str, Future]]
 
         self.reset()
 
+    def _read_shard(self, shard_fname: str) -> 'ParallelDataSet':
+        if self._next_shard is not None and self._next_shard[0] == shard_fname:
+            dataset = self._next_shard[1].result()
+        else:
+            dataset = ParallelDataSet.load(shard_fname)
+        self._next_shard = None
+        if self._executor is not None and self.shard_index < len(self.shards_fnames) - 1:
+            next_shard_fname = self.shards_fnames[self.shard_index + 1]
+            self._next_shard = (next_shard_fname, self._executor.submit(ParallelDataSet.load, next_shard_fname))
+        return dataset
+
     def _load_shard(self):
         shard_fname = self.shards_fnames[self.shard_index]
         logger.info("Loading shard %s.", shard_fname)
-        dataset = ParallelDataSet.load(self.shards_fnames[self.shard_index]).fill_up(self.bucket_batch_sizes,
-                                                                                     seed=self.shard_index)
+        # Only reading the next shard is done in the background. Filling up and shuffling happen here, in the thread
+        # calling next(), so that the random number generators are used in the same order as without prefetching.
+        dataset = self._read_shard(shard_fname).fill_up(self.bucket_batch_sizes, seed=self.shard_index)
         self.shard_iter = ParallelSampleIter(data=dataset,
                                              buckets=self.buckets,
                                              batch_size=self.batch_size,
@@ -1971,6 +2069,85 @@ class ParallelSampleIter(BaseParallelSampleIter):
         self.data = self.data.permute(self.data_permutations)
 
 
+class PrefetchingParallelSampleIter(BaseParallelSampleIter):
+    """
+    Wraps a parallel sample iterator and prepares the next batch in a background thread while the current batch is
+    being processed. The wrapped iterator always runs one batch ahead: a saved state includes the prefetched batch,
+    so an iterator restored from it continues with the batch following the last batch returned by next().
+    If contexts are given, prefetched batches are also split and copied to them, so that the host to device copy of
+    the next batch overlaps with computation on the current batch.
+    Note that the wrapped iterator's iter_next() and next() run on the worker thread, including any work they do
+    such as loading shards and the random number generator or MPI calls involved.
+
+    :param data_iter: The iterator to prefetch batches from.
+    :param context: Optional list of contexts to load prefetched batches to.
+    """
+
+    def __init__(self,
+                 data_iter: BaseParallelSampleIter,
+                 context: Optional[List[mx.context.Context]] = None) -> None:
+        super().__init__(buckets=data_iter.buckets,
+                         batch_size=data_iter.batch_size,
+                         bucket_batch_sizes=data_iter.bucket_batch_sizes,
+                         num_source_factors=data_iter.num_source_factors,
+                         num_target_factors=data_iter.num_target_factors,
+                         permute=data_iter.permute,
+                         dtype=data_iter.dtype)
+        self.data_iter = data_iter
+        self.context = context
+        self._executor = ThreadPoolExecutor(max_workers=1)
+        self._future = None  # type: Optional[Future]
+        self._next_batch = None  # type: Optional[Batch]
+        self._prefetch()
+
+    def _fetch(self) -> Optional['Batch']:
+        if not self.data_iter.iter_next():
+            return None
+        batch = self.data_iter.next()
+        if self.context is not None:
+            batch = batch.split_and_load(self.context)
+        return batch
+
+    def _prefetch(self):
+        self._future = self._executor.submit(self._fetch)
+
+    def _wait(self):
+        """
+        Blocks until the pending prefetch (if any) has finished.
+        """
+        if self._future is not None:
+            self._next_batch = self._future.result()
+            self._future = None
+
+    def reset(self):
+        self._wait()
+        self._next_batch = None
+        self.data_iter.reset()
+        self._prefetch()
+
+    def iter_next(self) -> bool:
+        self._wait()
+        return self._next_batch is not None
+
+    def next(self) -> 'Batch':
+        if not self.iter_next():
+            raise StopIteration
+        batch = self._next_batch
+        self._next_batch = None
+        self._prefetch()
+        return batch
+
+    def save_state(self, fname: str):
+        self._wait()
+        self.data_iter.save_state(fname)
+
+    def load_state(self, fname: str):
+        self._wait()
+        self._next_batch = None
+        self.data_iter.load_state(fname)
+        self._prefetch()
+
+
 class Batch:
 
     __slots__ = ['source', 'source_length', 'target', 'target_length', 'labels', 'samples', 'tokens']
@@ -1985,6 +2162,9 @@ class Batch:
         self.tokens = tokens
 
     def split_and_load(self, ctx: List[mx.context.Context]) -> 'Batch':
+        if isinstance(self.source, list):
+            # already split and loaded, e.g. by PrefetchingParallelSampleIter
+            return self
         source = mx.gluon.utils.split_and_load(self.source, ctx, batch_axis=0)
         source_length = mx.gluon.utils.split_and_load(self.source_length, ctx, batch_axis=0)
         target = mx.gluon.utils.split_and_load(self.target, ctx, batch_axis=0)
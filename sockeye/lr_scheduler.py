@@ -11,6 +11,7 @@
 # express or implied. See the License for the specific language governing
 # permissions and limitations under the License.
 
+import json
 import logging
 from math import sqrt
 from typing import Optional
@@ -185,6 +186,38 @@ class LearningRateSchedulerPlateauReduce(AdaptiveLearningRateScheduler):
         )
 
 
+LR_SCHEDULER_CLASSES = {cls.__name__: cls for cls in (LearningRateSchedulerInvSqrtDecay,
+                                                        LearningRateSchedulerLinearDecay,
+                                                        LearningRateSchedulerPlateauReduce)}
+
+
+def save_lr_scheduler(scheduler: LearningRateScheduler, fname: str):
+    """
+    Saves the type and attributes of a learning rate scheduler as JSON.
+
+    :param scheduler: Learning rate scheduler.
+    :param fname: Name of the file to write.
+    """
+    with open(fname, 'w') as out:
+        json.dump({'type': type(scheduler).__name__, 'state': scheduler.__dict__}, out)
+
+
+def load_lr_scheduler(fname: str) -> LearningRateScheduler:
+    """
+    Loads a learning rate scheduler saved with save_lr_scheduler().
+
+    :param fname: Name of the file to read.
+    :return: Learning rate scheduler.
+    """
+    with open(fname) as inp:
+        data = json.load(inp)
+    check_condition(data['type'] in LR_SCHEDULER_CLASSES, "Unknown learning rate scheduler type %s." % data['type'])
+    cls = LR_SCHEDULER_CLASSES[data['type']]
+    scheduler = cls.__new__(cls)
+    scheduler.__dict__.update(data['state'])
+    return scheduler
+
+
 def get_lr_scheduler(scheduler_type: str,
                      learning_rate_t_scale: float,
                      learning_rate_reduce_factor: float,
@@ -15,11 +15,13 @@
 import logging
 import os
 import sys
+from typing import Dict, Optional
 
 
 OMP_NUM_THREADS = 'OMP_NUM_THREADS'
 OMP_NUM_THREADS_ARG = '--omp-num-threads'
 ENV_ARG = '--env'
+MXNET_GPU_MEM_POOL_TYPE = 'MXNET_GPU_MEM_POOL_TYPE'
 
 
 logger = logging.getLogger(__name__)
@@ -46,9 +48,19 @@ def handle_omp_num_threads():
                 os.environ[var] = val
 
 
-def init():
+def set_env_defaults(env_defaults: Dict[str, str]):
+    '''Set environment variables that are not already set in the environment or with --env'''
+    for var, val in env_defaults.items():
+        if var not in os.environ:
+            logger.info('Setting %s=%s', var, val)
+            os.environ[var] = val
+
+
+def init(env_defaults: Optional[Dict[str, str]] = None):
     '''Call before importing mxnet module'''
     global initialized
     if not initialized:
         handle_omp_num_threads()
+        if env_defaults is not None:
+            set_env_defaults(env_defaults)
         initialized = True
@@ -15,10 +15,12 @@
 Simple Training CLI.
 """
 from . import pre_mxnet
-# Called before importing mxnet or any module that imports mxnet
-pre_mxnet.init()
+# Called before importing mxnet or any module that imports mxnet.
+# The rounding GPU memory pool lets differently shaped batches (buckets) reuse each other's allocations.
+pre_mxnet.init(env_defaults={pre_mxnet.MXNET_GPU_MEM_POOL_TYPE: 'Round'})
 
 import argparse
+import concurrent.futures
 import logging
 import os
 import shutil
@@ -55,10 +57,6 @@ from .utils import check_condition
 logger = logging.getLogger(__name__)
 
 
-def none_if_negative(val):
-    return None if val < 0 else val
-
-
 def _list_to_tuple(v):
     """Convert v to a tuple if it is a list."""
     if isinstance(v, list):
@@ -66,16 +64,6 @@ def _list_to_tuple(v):
     return v
 
 
-def _dict_difference(dict1: Dict, dict2: Dict):
-    diffs = set()
-    for k, v in dict1.items():
-        # Note: A list and a tuple with the same values is considered equal
-        # (this is due to json deserializing former tuples as list).
-        if k not in dict2 or _list_to_tuple(dict2[k]) != _list_to_tuple(v):
-            diffs.add(k)
-    return diffs
-
-
 def check_arg_compatibility(args: argparse.Namespace):
     """
     Check if some arguments are incompatible with each other.
@@ -127,6 +115,11 @@ def check_arg_compatibility(args: argparse.Namespace):
         # Length 1: expand the list to the appropriate length
         args.target_factors_share_embedding = args.target_factors_share_embedding * n_target_factors
 
+    # With --prefetch, shard switches (filling up, shuffling) run on the prefetch thread. Under Horovod these include
+    # MPI collectives, which must be issued from the main thread.
+    check_condition(not (args.prefetch and args.horovod),
+                    'Prefetching batches (--prefetch) is not supported with Horovod training (--horovod).')
+
 
 def check_resume(args: argparse.Namespace, output_folder: str) -> bool:
     """
@@ -152,11 +145,16 @@ def check_resume(args: argparse.Namespace, output_folder: str) -> bool:
             os.makedirs(output_folder)
         elif os.path.exists(training_state_dir):
             old_args = vars(arguments.load_args(os.path.join(output_folder, C.ARGS_STATE_NAME)))
-            arg_diffs = _dict_difference(vars(args), old_args) | _dict_difference(old_args, vars(args))
+            new_args = vars(args)
+            # Note: A list and a tuple with the same values are considered equal
+            # (this is due to json deserializing former tuples as list).
+            arg_diffs = {k for k in new_args.keys() | old_args.keys()
+                         if k not in new_args or k not in old_args
+                         or _list_to_tuple(new_args[k]) != _list_to_tuple(old_args[k])}
             # Remove args that may differ without affecting the training.
             arg_diffs -= set(C.ARGS_MAY_DIFFER)
             # allow different device-ids provided their total count is the same
-            if 'device_ids' in arg_diffs and len(old_args['device_ids']) == len(vars(args)['device_ids']):
+            if 'device_ids' in arg_diffs and len(old_args['device_ids']) == len(new_args['device_ids']):
                 arg_diffs.discard('device_ids')
             if not arg_diffs:
                 resume_training = True
@@ -281,10 +279,12 @@ def create_data_iters_and_vocabs(args: argparse.Namespace,
     word_min_count_source, word_min_count_target = args.word_min_count
     batch_num_devices = 1 if args.use_cpu else sum(-di if di < 0 else 1 for di in args.device_ids)
 
+    # Resolve relative paths against the working directory once rather than in every os.path.abspath call
+    cwd = os.getcwd()
     validation_sources = [args.validation_source] + args.validation_source_factors
-    validation_sources = [str(os.path.abspath(source)) for source in validation_sources]
+    validation_sources = [os.path.normpath(os.path.join(cwd, source)) for source in validation_sources]
     validation_targets = [args.validation_target] + args.validation_target_factors
-    validation_targets = [str(os.path.abspath(target)) for target in validation_targets]
+    validation_targets = [os.path.normpath(os.path.join(cwd, target)) for target in validation_targets]
 
     if args.horovod:
         horovod_data_error_msg = "Horovod training requires prepared training data.  Use `python -m " \
@@ -308,7 +308,8 @@ def create_data_iters_and_vocabs(args: argparse.Namespace,
             batch_size=args.batch_size,
             batch_type=args.batch_type,
             batch_num_devices=batch_num_devices,
-            batch_sentences_multiple_of=args.batch_sentences_multiple_of)
+            batch_sentences_multiple_of=args.batch_sentences_multiple_of,
+            prefetch_shards=args.prefetch)
 
         check_condition(all([combine in [C.FACTORS_COMBINE_SUM, C.FACTORS_COMBINE_AVERAGE]
                              for combine in args.source_factors_combine])
@@ -391,9 +392,9 @@ def create_data_iters_and_vocabs(args: argparse.Namespace,
                             len(args.target_factors), len(args.target_factors_num_embed)))
 
         sources = [args.source] + args.source_factors
-        sources = [str(os.path.abspath(s)) for s in sources]
+        sources = [os.path.normpath(os.path.join(cwd, s)) for s in sources]
         targets = [args.target] + args.target_factors
-        targets = [str(os.path.abspath(t)) for t in targets]
+        targets = [os.path.normpath(os.path.join(cwd, t)) for t in targets]
 
         check_condition(len(sources) == len(validation_sources),
                         'Training and validation data must have the same number of source factors, '
@@ -420,7 +421,8 @@ def create_data_iters_and_vocabs(args: argparse.Namespace,
             bucketing=not args.no_bucketing,
             bucket_width=args.bucket_width,
             bucket_scaling=args.bucket_scaling,
-            batch_sentences_multiple_of=args.batch_sentences_multiple_of)
+            batch_sentences_multiple_of=args.batch_sentences_multiple_of,
+            cache_dir=output_folder if args.cache_training_data else None)
 
         data_info_fname = os.path.join(output_folder, C.DATA_INFO)
         logger.info("Writing data config to '%s'", data_info_fname)
@@ -769,10 +771,7 @@ def create_optimizer_config(args: argparse.Namespace) -> OptimizerConfig:
     :param args: Arguments as returned by argparse.
     :return: The optimizer type and its parameters as well as the kvstore.
     """
-    optimizer_params = {'wd': args.weight_decay,
-                        "learning_rate": args.initial_learning_rate}
-
-    gradient_clipping_threshold = none_if_negative(args.gradient_clipping_threshold)
+    gradient_clipping_threshold = args.gradient_clipping_threshold if args.gradient_clipping_threshold >= 0 else None
     if gradient_clipping_threshold is None:
         logger.info("Gradient clipping threshold set to negative value. Will not perform gradient clipping.")
         gradient_clipping_type = C.GRADIENT_CLIPPING_TYPE_NONE
@@ -784,12 +783,14 @@ def create_optimizer_config(args: argparse.Namespace) -> OptimizerConfig:
 
     # Note: for 'abs' we use the implementation inside of MXNet's optimizer and 'norm_*' we implement ourselves
     # inside the TrainingModel.
-    if gradient_clipping_threshold is not None and gradient_clipping_type == C.GRADIENT_CLIPPING_TYPE_ABS:
-        optimizer_params["clip_gradient"] = gradient_clipping_threshold
-    if args.momentum is not None:
-        optimizer_params["momentum"] = args.momentum
     # We normalize by the number of non-PAD symbols in a batch we need to disable rescale_grad.
-    optimizer_params["rescale_grad"] = 1.0
+    optimizer_params = {k: v for k, v in (
+        ('wd', args.weight_decay),
+        ('learning_rate', args.initial_learning_rate),
+        ('clip_gradient',
+         gradient_clipping_threshold if gradient_clipping_type == C.GRADIENT_CLIPPING_TYPE_ABS else None),
+        ('momentum', args.momentum),
+        ('rescale_grad', 1.0)) if v is not None}
     if args.dtype == C.DTYPE_FP16:
         os.environ[C.MXNET_SAFE_ACCUMULATION] = '1'
         optimizer_params["multi_precision"] = True
@@ -986,6 +987,8 @@ def train(args: argparse.Namespace, custom_metrics_logger: Optional[Callable] =
                                                                  "divisible by the number of devices. Choose a batch "
                                                                  "size that is a multiple of %d." % len(context))
         logger.info("Training Device(s): %s", ", ".join(str(c) for c in context))
+        if not args.use_cpu:
+            utils.init_device_contexts(context)
 
         utils.seed_rngs(args.seed, ctx=context)
 
@@ -997,6 +1000,10 @@ def train(args: argparse.Namespace, custom_metrics_logger: Optional[Callable] =
             resume_training=resume_training,
             output_folder=output_folder)
 
+        if args.prefetch:
+            train_iter = data_io.PrefetchingParallelSampleIter(train_iter, context=context)
+            eval_iter = data_io.PrefetchingParallelSampleIter(eval_iter, context=context)
+
         if max_seq_len_source != config_data.max_seq_len_source:
             logger.info("Maximum source length determined by prepared data. Using %d instead of %d",
                         config_data.max_seq_len_source, max_seq_len_source)
@@ -1006,10 +1013,13 @@ def train(args: argparse.Namespace, custom_metrics_logger: Optional[Callable] =
                         config_data.max_seq_len_target, max_seq_len_target)
             max_seq_len_target = config_data.max_seq_len_target
 
-        # Dump the vocabularies if we're just starting up
+        # Dump the vocabularies if we're just starting up. The files are written in the background while the model
+        # and trainer are built.
+        vocab_writes = []  # type: List[concurrent.futures.Future]
         if not resume_training:
-            vocab.save_source_vocabs(source_vocabs, output_folder)
-            vocab.save_target_vocabs(target_vocabs, output_folder)
+            vocab_writer = exit_stack.enter_context(concurrent.futures.ThreadPoolExecutor(max_workers=2))
+            vocab_writes = [vocab_writer.submit(vocab.save_source_vocabs, source_vocabs, output_folder),
+                            vocab_writer.submit(vocab.save_target_vocabs, target_vocabs, output_folder)]
 
         source_vocab_sizes = [len(v) for v in source_vocabs]
         target_vocab_sizes = [len(v) for v in target_vocabs]
@@ -1139,6 +1149,9 @@ def train(args: argparse.Namespace, custom_metrics_logger: Optional[Callable] =
         cp_decoder = create_checkpoint_decoder(args, exit_stack, context,
                                                training_model, source_vocabs, target_vocabs, hybridize=hybridize)
 
+        for vocab_write in vocab_writes:
+            vocab_write.result()  # re-raises any error from writing the vocabularies
+
         training_state = trainer.fit(train_iter=train_iter, validation_iter=eval_iter, checkpoint_decoder=cp_decoder)
         return training_state
 
@@ -216,24 +216,31 @@ class GluonEarlyStoppingTrainer:
                         self.config.max_updates,
                         self.config.max_checkpoints)
 
+        # Stopping criteria and the checkpoint interval do not change during training
+        max_epochs = self.config.max_epochs
+        max_updates = self.config.max_updates
+        max_samples = self.config.max_samples
+        max_seconds = self.config.max_seconds
+        checkpoint_batches = self.config.checkpoint_interval * self.config.update_interval
+
         checkpoint_up_to_date = False
         while True:
-            if self.config.max_epochs is not None and self.state.epoch == self.config.max_epochs:
-                logger.info("Maximum # of epochs (%s) reached.", self.config.max_epochs)
+            if max_epochs is not None and self.state.epoch == max_epochs:
+                logger.info("Maximum # of epochs (%s) reached.", max_epochs)
                 if not checkpoint_up_to_date:
                     time_cost = time.time() - tic
                     self._create_checkpoint(checkpoint_decoder, time_cost, train_iter, validation_iter)
                 break
 
-            if self.config.max_updates is not None and self.state.updates == self.config.max_updates:
-                logger.info("Maximum # of updates (%s) reached.", self.config.max_updates)
+            if max_updates is not None and self.state.updates == max_updates:
+                logger.info("Maximum # of updates (%s) reached.", max_updates)
                 if not checkpoint_up_to_date:
                     time_cost = time.time() - tic
                     self._create_checkpoint(checkpoint_decoder, time_cost, train_iter, validation_iter)
                 break
 
-            if self.config.max_samples is not None and self.state.samples >= self.config.max_samples:
-                logger.info("Maximum # of samples (%s) reached", self.config.max_samples)
+            if max_samples is not None and self.state.samples >= max_samples:
+                logger.info("Maximum # of samples (%s) reached", max_samples)
                 if not checkpoint_up_to_date:
                     time_cost = time.time() - tic
                     self._create_checkpoint(checkpoint_decoder, time_cost, train_iter, validation_iter)
@@ -246,15 +253,14 @@ class GluonEarlyStoppingTrainer:
                 self.state.epoch += 1
                 train_iter.reset()
 
-            if self.state.updates > 0 and self.state.batches % (
-                    self.config.checkpoint_interval * self.config.update_interval) == 0:
+            if self.state.updates > 0 and self.state.batches % checkpoint_batches == 0:
                 time_cost = time.time() - tic
                 self._create_checkpoint(checkpoint_decoder, time_cost, train_iter, validation_iter)
                 checkpoint_up_to_date = True
 
-                if self.config.max_seconds is not None and self.state.time_elapsed >= self.config.max_seconds:
+                if max_seconds is not None and self.state.time_elapsed >= max_seconds:
                     logger.info("Maximum # of seconds (%s) reached. Training ran for %d seconds.",
-                                self.config.max_seconds, self.state.time_elapsed)
+                                max_seconds, self.state.time_elapsed)
                     break
 
                 if self.state.converged or self.state.diverged:
@@ -334,12 +340,13 @@ class GluonEarlyStoppingTrainer:
         self.state.batches += 1
         loss_outputs = self._forward_backward(batch)
 
+        update_interval = self.config.update_interval
         did_grad_step = False
-        if self.config.update_interval == 1 or self.state.batches % self.config.update_interval == 0:
+        if update_interval == 1 or self.state.batches % update_interval == 0:
             # `step` rescales the gradients for the number of batches in this
             # update.
-            self.trainer.step(batch_size=self.config.update_interval)
-            if self.config.update_interval > 1:
+            self.trainer.step(batch_size=update_interval)
+            if update_interval > 1:
                 # Multi-batch updates sum gradients for each batch instead of
                 # overwriting, so gradients must be manually zeroed after each
                 # update.
@@ -579,15 +586,18 @@ class GluonEarlyStoppingTrainer:
 
     def _save_lr_scheduler(self, fname):
         if self.trainer.optimizer.lr_scheduler is not None:
-            with open(fname, "wb") as fp:
-                pickle.dump(self.trainer.optimizer.lr_scheduler, fp)
+            lr_scheduler.save_lr_scheduler(self.trainer.optimizer.lr_scheduler, fname)
             logger.info("Saved '%s' to '%s'", self.trainer.optimizer.lr_scheduler, fname)
 
     def _load_lr_scheduler(self, fname):
+        legacy_fname = os.path.join(os.path.dirname(fname), C.LR_SCHEDULER_LAST_PICKLE)
         if os.path.exists(fname):
-            with open(fname, "rb") as fp:
-                self.trainer.optimizer.lr_scheduler = pickle.load(fp)
+            self.trainer.optimizer.lr_scheduler = lr_scheduler.load_lr_scheduler(fname)
             logger.info("Loaded '%s' from '%s'", self.trainer.optimizer.lr_scheduler, fname)
+        elif os.path.exists(legacy_fname):
+            with open(legacy_fname, "rb") as fp:
+                self.trainer.optimizer.lr_scheduler = pickle.load(fp)
+            logger.info("Loaded '%s' from '%s'", self.trainer.optimizer.lr_scheduler, legacy_fname)
         self.trainer.optimizer.begin_num_update = self.state.updates
         self.trainer.optimizer.num_update = self.state.updates
 
@@ -327,6 +327,10 @@ def determine_context(device_ids: List[int],
                             "When using Horovod, --device-ids should be a negative integer indicating the number of "
                             "GPUs each worker should use.")
             n_ids = -device_ids[0]
+            if num_gpus < (horovod_mpi.hvd.local_rank() + 1) * n_ids:
+                logger.warning("Horovod local rank %d requests GPUs %d to %d, but only %d GPU(s) are visible.",
+                               horovod_mpi.hvd.local_rank(), horovod_mpi.hvd.local_rank() * n_ids,
+                               (horovod_mpi.hvd.local_rank() + 1) * n_ids - 1, num_gpus)
             context = [mx.gpu(_id + horovod_mpi.hvd.local_rank() * n_ids) for _id in range(n_ids)]
         else:
             if disable_device_locking:
@@ -337,6 +341,20 @@ def determine_context(device_ids: List[int],
     return context
 
 
+def init_device_contexts(context: List[mx.Context]) -> List[mx.nd.NDArray]:
+    """
+    Initializes the given devices by allocating a small array on each of them before training starts. The allocations
+    are all issued to MXNet's asynchronous engine before waiting for any of them, so device initialization is not
+    serialized by the caller; whether it overlaps across GPUs depends on the engine.
+
+    :param context: List of MXNet contexts.
+    :return: The allocated arrays, one per context.
+    """
+    arrays = [mx.nd.zeros((1,), ctx=ctx) for ctx in context]
+    mx.nd.waitall()
+    return arrays
+
+
 def expand_requested_device_ids(requested_device_ids: List[int]) -> List[int]:
     """
     Transform a list of device id requests to concrete device ids. For example on a host with 8 GPUs when requesting
@@ -374,7 +392,7 @@ def _expand_requested_device_ids(requested_device_ids: List[int], num_gpus_avail
 
 
 @contextmanager
-def acquire_gpus(requested_device_ids: List[int], lock_dir: str = "/tmp",
+def acquire_gpus(requested_device_ids: List[int], lock_dir: str = C.DEFAULT_LOCK_DIR,
                  retry_wait_min: int = 10, retry_wait_rand: int = 60,
                  num_gpus_available: Optional[int] = None):
     """
@@ -397,7 +415,8 @@ def acquire_gpus(requested_device_ids: List[int], lock_dir: str = "/tmp",
         raise RuntimeError("Can not acquire GPU, as no GPUs were found on this machine.")
 
     if not os.path.exists(lock_dir):
-        raise IOError("Lock directory %s does not exist." % lock_dir)
+        logger.info("Creating lock directory %s", lock_dir)
+        os.makedirs(lock_dir, mode=0o777, exist_ok=True)
 
     if not os.access(lock_dir, os.W_OK):
         raise IOError("Lock directory %s is not writeable." % lock_dir)
@@ -16,7 +16,7 @@ import json
 import logging
 import os
 from collections import Counter
-from contextlib import ExitStack
+from concurrent.futures import ProcessPoolExecutor
 from functools import reduce
 from itertools import chain, islice
 from typing import Dict, Iterable, List, Optional, Tuple
@@ -45,10 +45,27 @@ def build_from_paths(paths: List[str], num_words: Optional[int] = None, min_coun
     :param pad_to_multiple_of: If not None, pads the vocabulary to a size that is the next multiple of this int.
     :return: Word-to-id mapping.
     """
-    with ExitStack() as stack:
-        logger.info("Building vocabulary from dataset(s): %s", paths)
-        files = (stack.enter_context(utils.smart_open(path)) for path in paths)
-        return build_vocab(chain(*files), num_words, min_count, pad_to_multiple_of)
+    logger.info("Building vocabulary from dataset(s): %s", paths)
+    if len(paths) == 1:
+        raw_vocab = count_tokens(paths[0])
+    else:
+        # Count the tokens of the files in separate processes
+        with ProcessPoolExecutor(max_workers=min(len(paths), os.cpu_count() or 1)) as executor:
+            raw_vocab = merge_raw_vocabs(*executor.map(count_tokens, paths))
+    return build_pruned_vocab(raw_vocab=raw_vocab - Counter(set(C.VOCAB_SYMBOLS)),
+                              num_words=num_words,
+                              min_count=min_count,
+                              pad_to_multiple_of=pad_to_multiple_of)
+
+
+def count_tokens(path: str) -> Counter:
+    """
+    Returns the token counts of a file in sentence-per-line format.
+
+    :param path: Path to a file with one sentence per line.
+    """
+    with utils.smart_open(path) as data:
+        return build_raw_vocab(data)
 
 
 def build_raw_vocab(data: Iterable[str]) -> Counter:
@@ -330,6 +347,15 @@ def load_or_create_vocabs(source_paths: List[str],
             logger.info("Using %s as a shared source/target vocabulary." % vocab_path)
             vocab_source = vocab_target = vocab_from_json(vocab_path)
 
+    elif source_vocab_path is None and target_vocab_path is None:
+        # Source and target vocabularies are independent: build them in parallel processes
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            future_source = executor.submit(load_or_create_vocab, source_path, source_vocab_path, num_words_source,
+                                            word_min_count_source, pad_to_multiple_of=pad_to_multiple_of)
+            future_target = executor.submit(load_or_create_vocab, target_path, target_vocab_path, num_words_target,
+                                            word_min_count_target, pad_to_multiple_of=pad_to_multiple_of)
+            vocab_source, vocab_target = future_source.result(), future_target.result()
+
     else:
         vocab_source = load_or_create_vocab(source_path, source_vocab_path, num_words_source, word_min_count_source,
                                             pad_to_multiple_of=pad_to_multiple_of)
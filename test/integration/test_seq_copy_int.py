@@ -53,7 +53,7 @@ ENCODER_DECODER_SETTINGS_TEMPLATE = [
      " --batch-size 2 --max-updates 2 --batch-type sentence --decode-and-evaluate 0"
      # Note: We set the checkpoint interval > max updates in order to make sure we create a checkpoint when reaching 
      # max updates independent of the checkpoint interval
-     " --checkpoint-interval 20 --optimizer adam --initial-learning-rate 0.01",
+     " --checkpoint-interval 20 --optimizer adam --initial-learning-rate 0.01 --cache-training-data",
      "--beam-size 2 --nbest-size 2",
      False, 0, 0),
     # Basic transformer w/ prepared data & greedy decoding
@@ -89,7 +89,8 @@ ENCODER_DECODER_SETTINGS_TEMPLATE = [
      " --weight-tying-type src_trg_softmax"
      " --weight-init-scale=3.0 --weight-init-xavier-factor-type=avg"
      " --batch-size 2 --max-updates 2 --batch-type sentence  --decode-and-evaluate 0"
-     " --checkpoint-interval 2 --optimizer adam --initial-learning-rate 0.01 --lhuc all",
+     " --checkpoint-interval 2 --optimizer adam --initial-learning-rate 0.01 --lhuc all"
+     " --prefetch",
      "--beam-size 2",
      False, 0, 0),
     # Basic transformer and length ratio prediction, and learned brevity penalty during inference
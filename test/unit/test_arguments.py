@@ -16,6 +16,8 @@ import pytest
 import tempfile
 import os
 import re
+import subprocess
+import sys
 
 import sockeye.arguments as arguments
 import sockeye.constants as C
@@ -30,6 +32,11 @@ def test_simple_dict():
     assert parse(dict_str) == expected
 
 
+def test_arguments_do_not_import_mxnet():
+    subprocess.check_call([sys.executable, "-c",
+                           "import sys; import sockeye.arguments; assert 'mxnet' not in sys.modules"])
+
+
 # note that while --prepared-data and --source/--target are mutually exclusive this is not the case at the CLI level
 @pytest.mark.parametrize("test_params, expected_params", [
     # mandatory parameters
@@ -45,7 +52,7 @@ def test_simple_dict():
           validation_source='test_validation_src', validation_target='test_validation_tgt',
           validation_source_factors=[],
           validation_target_factors=[],
-          output='test_output', overwrite_output=False,
+          output='test_output', overwrite_output=False, cache_training_data=False,
           source_vocab=None, target_vocab=None, source_factor_vocabs=[], target_factor_vocabs=[],
           shared_vocab=False, num_words=(0, 0),
           word_min_count=(1, 1), pad_vocab_to_multiple_of=None,
@@ -65,7 +72,7 @@ def test_simple_dict():
           validation_source='test_validation_src', validation_target='test_validation_tgt',
           validation_source_factors=[],
           validation_target_factors=[],
-          output='test_output', overwrite_output=False,
+          output='test_output', overwrite_output=False, cache_training_data=False,
           source_vocab=None, target_vocab=None, source_factor_vocabs=[], target_factor_vocabs=[],
           shared_vocab=False, num_words=(0, 0),
           word_min_count=(1, 1), pad_vocab_to_multiple_of=None,
@@ -106,6 +113,11 @@ def test_device_args(test_params, expected_params):
     _test_args(test_params, expected_params, arguments.add_device_args)
 
 
+def test_lock_dir_from_environment(monkeypatch):
+    monkeypatch.setenv(C.SOCKEYE_LOCK_DIR, 'env_lock_dir')
+    _test_args_subset('', dict(lock_dir='env_lock_dir'), {}, arguments.add_device_args)
+
+
 @pytest.mark.parametrize("test_params, expected_params", [
     ('', dict(params=None,
               allow_missing_params=False,
@@ -226,6 +238,7 @@ def test_inference_args(test_params, expected_params):
               decode_and_evaluate=500,
               decode_and_evaluate_device_id=None,
               stop_training_on_decoder_failure=False,
+              prefetch=False,
               seed=1,
               keep_last_params=-1,
               keep_initializations=False,
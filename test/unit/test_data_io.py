@@ -15,6 +15,7 @@ import os
 import random
 from tempfile import TemporaryDirectory
 from typing import Optional, List, Tuple
+from unittest import mock
 
 import mxnet as mx
 import numpy as np
@@ -577,6 +578,53 @@ def test_get_training_data_iters():
             train_iter.reset()
 
 
+def test_get_training_data_iters_cache():
+    max_length = 30
+    batch_size = 5
+    with tmp_digits_dataset("tmp_corpus", 100, 0, max_length - C.SPACE_FOR_XOS, 20, max_length - C.SPACE_FOR_XOS,
+                            20, 0, max_length - C.SPACE_FOR_XOS) as data, TemporaryDirectory() as cache_dir:
+        vcb = vocab.build_from_paths([data['train_source'], data['train_target']])
+
+        def get_iters():
+            random.seed(1)
+            np.random.seed(1)
+            return data_io.get_training_data_iters(sources=[data['train_source']],
+                                                   targets=[data['train_target']],
+                                                   validation_sources=[data['dev_source']],
+                                                   validation_targets=[data['dev_target']],
+                                                   source_vocabs=[vcb],
+                                                   target_vocabs=[vcb],
+                                                   source_vocab_paths=[None],
+                                                   target_vocab_paths=[None],
+                                                   shared_vocab=True,
+                                                   batch_size=batch_size,
+                                                   batch_type=C.BATCH_TYPE_SENTENCE,
+                                                   batch_num_devices=1,
+                                                   max_seq_len_source=max_length,
+                                                   max_seq_len_target=max_length,
+                                                   bucketing=True,
+                                                   bucket_width=10,
+                                                   cache_dir=cache_dir)
+
+        train_iter, _, config_data, _ = get_iters()
+        key = data_io.get_training_data_cache_key([data['train_source']], [data['train_target']], [vcb], [vcb],
+                                                  max_length, max_length, True, 10, True)
+        assert os.path.exists(os.path.join(cache_dir, C.TRAINING_DATA_CACHE % key))
+        assert os.path.exists(os.path.join(cache_dir, C.TRAINING_DATA_CACHE_STATS % key))
+
+        with mock.patch('sockeye.data_io.define_parallel_buckets', side_effect=AssertionError):
+            cached_train_iter, _, cached_config_data, _ = get_iters()
+        assert cached_config_data.data_statistics == config_data.data_statistics
+        assert cached_train_iter.buckets == train_iter.buckets
+        while train_iter.iter_next():
+            assert _data_batches_equal(train_iter.next(), cached_train_iter.next())
+        assert not cached_train_iter.iter_next()
+
+        # Different settings use a different cache entry
+        assert data_io.get_training_data_cache_key([data['train_source']], [data['train_target']], [vcb], [vcb],
+                                                   max_length, max_length, True, 5, True) != key
+
+
 def _data_batches_equal(db1: data_io.Batch, db2: data_io.Batch) -> bool:
     equal = True
     equal = equal and np.allclose(db1.source.asnumpy(), db2.source.asnumpy())
@@ -797,6 +845,121 @@ def test_sharded_and_parallel_iter_same_num_batches():
         assert num_batches_seen == num_batches
 
 
+def test_sharded_parallel_sample_iter_prefetch_shards():
+    batch_size = 2
+    buckets = data_io.define_parallel_buckets(100, 100, 10, 1, 1.0)
+    bucket_batch_sizes = data_io.define_bucket_batch_sizes(buckets,
+                                                           batch_size,
+                                                           batch_type=C.BATCH_TYPE_SENTENCE,
+                                                           batch_num_devices=1,
+                                                           data_target_average_len=[None] * len(buckets))
+
+    with TemporaryDirectory() as work_dir:
+        shard_fnames = [os.path.join(work_dir, 'shard%d' % i) for i in range(3)]
+        for shard_fname in shard_fnames:
+            data_io.ParallelDataSet(*_get_random_bucketed_data(buckets, min_count=1, max_count=5)).save(shard_fname)
+
+        def collect_batches(prefetch_shards: bool):
+            # shards and batches are shuffled with the global RNGs whenever a shard is loaded
+            random.seed(1)
+            np.random.seed(1)
+            it = data_io.ShardedParallelSampleIter(shard_fnames, buckets, batch_size, bucket_batch_sizes,
+                                                   prefetch_shards=prefetch_shards)
+            batches = []
+            for _ in range(2):
+                while it.iter_next():
+                    batches.append(it.next())
+                assert not it.iter_next()
+                it.reset()
+            return batches
+
+        expected_batches = collect_batches(prefetch_shards=False)
+        batches = collect_batches(prefetch_shards=True)
+        assert len(batches) == len(expected_batches) > 0
+        for expected_batch, batch in zip(expected_batches, batches):
+            assert _data_batches_equal(expected_batch, batch)
+
+
+def test_prefetching_parallel_sample_iter():
+    batch_size = 2
+    buckets = data_io.define_parallel_buckets(100, 100, 10, True, 1.0)
+    bucket_batch_sizes = data_io.define_bucket_batch_sizes(buckets,
+                                                           batch_size,
+                                                           batch_type=C.BATCH_TYPE_SENTENCE,
+                                                           batch_num_devices=1,
+                                                           data_target_average_len=[None] * len(buckets))
+    dataset = data_io.ParallelDataSet(*_get_random_bucketed_data(buckets, min_count=0, max_count=5))
+
+    random.seed(1)
+    np.random.seed(1)
+    it = data_io.ParallelSampleIter(dataset, buckets, batch_size, bucket_batch_sizes)
+    random.seed(1)
+    np.random.seed(1)
+    it_prefetching = data_io.PrefetchingParallelSampleIter(
+        data_io.ParallelSampleIter(dataset, buckets, batch_size, bucket_batch_sizes))
+
+    for _ in range(2):
+        num_batches_seen = 0
+        while it.iter_next():
+            assert it_prefetching.iter_next()
+            assert _data_batches_equal(it.next(), it_prefetching.next())
+            num_batches_seen += 1
+        assert num_batches_seen > 0
+        assert not it_prefetching.iter_next()
+        with pytest.raises(StopIteration):
+            it_prefetching.next()
+        random.seed(2)
+        np.random.seed(2)
+        it.reset()
+        random.seed(2)
+        np.random.seed(2)
+        it_prefetching.reset()
+
+    with TemporaryDirectory() as work_dir:
+        # A restored iterator continues with the batch following the last one returned
+        it_prefetching.next()
+        fname = os.path.join(work_dir, "saved_iter")
+        it_prefetching.save_state(fname)
+        expected_batch = it_prefetching.next()
+
+        it_loaded = data_io.PrefetchingParallelSampleIter(
+            data_io.ParallelSampleIter(dataset, buckets, batch_size, bucket_batch_sizes))
+        it_loaded.load_state(fname)
+        assert _data_batches_equal(it_loaded.next(), expected_batch)
+
+
+def test_prefetching_parallel_sample_iter_split_and_load():
+    batch_size = 4
+    buckets = data_io.define_parallel_buckets(100, 100, 10, True, 1.0)
+    bucket_batch_sizes = data_io.define_bucket_batch_sizes(buckets,
+                                                           batch_size,
+                                                           batch_type=C.BATCH_TYPE_SENTENCE,
+                                                           batch_num_devices=2,
+                                                           data_target_average_len=[None] * len(buckets))
+    dataset = data_io.ParallelDataSet(*_get_random_bucketed_data(buckets, min_count=0, max_count=5))
+    context = [mx.cpu(0), mx.cpu(1)]
+
+    random.seed(1)
+    np.random.seed(1)
+    it = data_io.ParallelSampleIter(dataset, buckets, batch_size, bucket_batch_sizes)
+    random.seed(1)
+    np.random.seed(1)
+    it_prefetching = data_io.PrefetchingParallelSampleIter(
+        data_io.ParallelSampleIter(dataset, buckets, batch_size, bucket_batch_sizes), context=context)
+
+    while it.iter_next():
+        expected = it.next().split_and_load(context)
+        batch = it_prefetching.next()
+        assert isinstance(batch.source, list)
+        assert [source.context for source in batch.source] == context
+        # splitting a loaded batch again is a no-op
+        assert batch.split_and_load(context) is batch
+        for expected_shard, shard in zip(expected.shards(), batch.shards()):
+            for expected_input, actual_input in zip(expected_shard[0], shard[0]):
+                assert np.array_equal(expected_input.asnumpy(), actual_input.asnumpy())
+    assert not it_prefetching.iter_next()
+
+
 def test_create_target_and_shifted_label_sequences():
     target_and_label = mx.nd.array([[C.BOS_ID, 4, 17, 35, 12, C.EOS_ID, C.PAD_ID, C.PAD_ID],
                                     [C.BOS_ID, 15, 23, 23, 77, 55, 22, C.EOS_ID],
@@ -11,6 +11,9 @@
 # express or implied. See the License for the specific language governing
 # permissions and limitations under the License.
 
+import os
+from tempfile import TemporaryDirectory
+
 import pytest
 
 import numpy as np
@@ -91,3 +94,25 @@ def test_get_lr_scheduler_no_reduce():
                                               learning_rate_reduce_factor=1.0,
                                               learning_rate_reduce_num_not_improved=16)
     assert scheduler is None
+
+
+@pytest.mark.parametrize('scheduler_type', ['inv-sqrt-decay', 'linear-decay', 'plateau-reduce'])
+def test_save_load_lr_scheduler(scheduler_type):
+    scheduler = lr_scheduler.get_lr_scheduler(scheduler_type,
+                                              learning_rate_t_scale=1,
+                                              learning_rate_reduce_factor=0.5,
+                                              learning_rate_reduce_num_not_improved=16,
+                                              learning_rate_warmup=10,
+                                              max_updates=100)
+    scheduler.base_lr = 0.1
+    for t in range(1, 20):
+        scheduler(t)
+
+    with TemporaryDirectory() as work_dir:
+        fname = os.path.join(work_dir, 'lr_scheduler.json')
+        lr_scheduler.save_lr_scheduler(scheduler, fname)
+        loaded_scheduler = lr_scheduler.load_lr_scheduler(fname)
+
+    assert type(loaded_scheduler) is type(scheduler)
+    assert loaded_scheduler.__dict__ == scheduler.__dict__
+    assert loaded_scheduler(20) == scheduler(20)
@@ -49,6 +49,13 @@ def test_expand_requested_device_ids(requested_device_ids, num_gpus_available, e
     assert set(utils._expand_requested_device_ids(requested_device_ids, num_gpus_available)) == set(expected)
 
 
+def test_init_device_contexts():
+    context = [mx.cpu(0), mx.cpu(1)]
+    arrays = utils.init_device_contexts(context)
+    assert [array.context for array in arrays] == context
+    assert all(array.asnumpy().tolist() == [0.0] for array in arrays)
+
+
 @pytest.mark.parametrize("requested_device_ids, num_gpus_available, expected", device_params)
 def test_acquire_gpus(tmpdir, requested_device_ids, num_gpus_available, expected):
     with utils.acquire_gpus(requested_device_ids, lock_dir=str(tmpdir),
@@ -59,6 +66,14 @@ def test_acquire_gpus(tmpdir, requested_device_ids, num_gpus_available, expected
         assert len(tmpdir.listdir()) == len(acquired_gpus)
 
 
+def test_acquire_gpus_creates_lock_dir(tmpdir):
+    lock_dir = os.path.join(str(tmpdir), "locks")
+    with utils.acquire_gpus([-1], lock_dir=lock_dir, num_gpus_available=1) as acquired_gpus:
+        assert os.path.isdir(lock_dir)
+        assert acquired_gpus == [0]
+        assert len(os.listdir(lock_dir)) == 1
+
+
 # We expect the following settings to raise a ValueError
 device_params_expected_exception = [
     # requesting the same gpu twice
@@ -11,13 +11,16 @@
 # express or implied. See the License for the specific language governing
 # permissions and limitations under the License.
 
+import os
+from tempfile import TemporaryDirectory
+
 import pytest
 from unittest import mock
 from collections import Counter
 
 import sockeye.constants as C
 from sockeye.vocab import (build_vocab, get_ordered_tokens_from_vocab, is_valid_vocab, \
-    _get_sorted_source_vocab_fnames, build_raw_vocab, merge_raw_vocabs)
+    _get_sorted_source_vocab_fnames, build_raw_vocab, merge_raw_vocabs, build_from_paths)
 
 
 def test_build_raw_vocab():
@@ -61,6 +64,20 @@ def test_build_vocab(data, size, min_count, expected):
     assert vocab == expected
 
 
+@pytest.mark.parametrize("data,size,min_count,expected", test_vocab)
+def test_build_from_paths(data, size, min_count, expected):
+    with TemporaryDirectory() as work_dir:
+        paths = []
+        for i, line in enumerate(data + ["<s> </s>"]):
+            paths.append(os.path.join(work_dir, "data%d" % i))
+            with open(paths[-1], "w") as out:
+                print(line, file=out)
+        # Files are counted in parallel and merged
+        assert build_from_paths(paths, num_words=size, min_count=min_count) == expected
+        assert build_from_paths(paths[:1], num_words=size, min_count=min_count) == build_vocab(data[:1], size,
+                                                                                             min_count)
+
+
 @pytest.mark.parametrize("num_types,pad_to_multiple_of,expected_vocab_size",
                          [(4, None, 8), (2, 8, 8), (4, 8, 8), (8, 8, 16), (10, 16, 16), (13, 16, 32)])
 def test_padded_build_vocab(num_types, pad_to_multiple_of, expected_vocab_size):